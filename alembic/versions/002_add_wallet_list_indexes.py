@@ -0,0 +1,33 @@
+"""add wallet list indexes
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [idx['name'] for idx in inspector.get_indexes('wallets')]
+
+    if 'ix_wallets_owner_created_at' not in indexes:
+        op.create_index('ix_wallets_owner_created_at', 'wallets', ['owner', 'created_at'], unique=False)
+    if 'ix_wallets_created_at' not in indexes:
+        op.create_index('ix_wallets_created_at', 'wallets', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_wallets_created_at', table_name='wallets')
+    op.drop_index('ix_wallets_owner_created_at', table_name='wallets')
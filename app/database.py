@@ -1,6 +1,8 @@
 """
 Database configuration and connection management.
 """
+from typing import AsyncIterator
+
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.models.database import Base
@@ -84,10 +86,16 @@ class DatabaseManager:
 db_manager = DatabaseManager()
 
 
-async def get_db_session() -> AsyncSession:
-    """Dependency for FastAPI to get database session."""
-    async with db_manager.get_session() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
\ No newline at end of file
+async def get_db_session() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency for FastAPI to get database session.
+
+    Yields one session per request; FastAPI caches the dependency, so every
+    service resolved for the same request shares it, and it is closed once
+    the response has been produced.
+    """
+    session = await db_manager.get_session()
+    try:
+        yield session
+    finally:
+        await session.close()
\ No newline at end of file
@@ -3,6 +3,7 @@ from typing import List, Optional
 from fastapi import FastAPI, HTTPException, Query, Depends, Body
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from app.models.responses import (
     WalletInfoResponse,
@@ -14,7 +15,7 @@ from app.models.responses import (
     WalletUpdateRequest,
     WalletResponse,
 )
-from app.services.tron_service import TronService
+from app.services.tron_service import TronService, close_http_client as close_tron_http_client
 from app.services.solana_service import SolanaService
 from app.services.ethereum_service import EthereumService
 from app.services.bnb_service import BnbService
@@ -30,10 +31,11 @@ from app.middlewares import (
     IPWhitelistMiddleware,
     RequestLoggingMiddleware
 )
-from app.database import db_manager
+from app.database import db_manager, get_db_session
 from app.config import Config
 from app.models.database import RequestLog
 from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 
 app = FastAPI(title="Multi‑Blockchain API", version="0.1.0")
 
@@ -48,8 +50,9 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Clean up database connections on shutdown."""
+    """Clean up database and upstream HTTP connections on shutdown."""
     await db_manager.close()
+    await close_tron_http_client()
 
 
 # Add request logging middleware
@@ -73,12 +76,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON responses (transaction lists) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 tron_service = TronService()
 solana_service = SolanaService()
 ethereum_service = EthereumService()
 bnb_service = BnbService()
 base_net_service = BaseNetService()
-wallet_service = WalletService()
+
+def get_wallet_service(session: AsyncSession = Depends(get_db_session)) -> WalletService:
+    """Provide a WalletService bound to the request's database session."""
+    return WalletService(session)
 
 # Authentication endpoint
 @app.post("/auth/login", response_model=Token)
@@ -111,7 +120,8 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
 async def wallet_info(
     wallet_address: str = Query(..., description="Wallet address to query"),
     blockchain: str = Query(..., description="Blockchain: 'tron', 'solana', 'ethereum', 'bnb', or 'base'"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    wallet_service: WalletService = Depends(get_wallet_service)
 ):
     """
     Retrieve wallet balance and token holdings.  Delegates the call
@@ -121,7 +131,7 @@ async def wallet_info(
     chain = blockchain.lower()
     response = None
     if chain == "tron":
-        response = tron_service.get_wallet_info(wallet_address)
+        response = await tron_service.get_wallet_info(wallet_address)
     elif chain == "solana":
         response = solana_service.get_wallet_info(wallet_address)
     elif chain == "ethereum":
@@ -150,7 +160,8 @@ async def transactions_list(
     token: str = Query(None, description="Token contract address to filter transactions"),
     start_date: str = Query(None, description="Start date filter (ISO format: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS). Supported for all chains."),
     end_date: str = Query(None, description="End date filter (ISO format: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS). Supported for all chains."),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    wallet_service: WalletService = Depends(get_wallet_service)
 ):
     """
     Get transaction history for a wallet. Combines native and token
@@ -163,7 +174,7 @@ async def transactions_list(
         limit = 1
     response = None
     if chain == "tron":
-        response = tron_service.get_transactions_list(wallet_address, limit, token, start_date, end_date)
+        response = await tron_service.get_transactions_list(wallet_address, limit, token, start_date, end_date)
     elif chain == "solana":
         response = solana_service.get_transactions_list(wallet_address, limit, token, start_date, end_date)
     elif chain == "ethereum":
@@ -200,7 +211,7 @@ async def contract_details(
     """
     chain = blockchain.lower()
     if chain == "tron":
-        return tron_service.get_contract_details(contract_address)
+        return await tron_service.get_contract_details(contract_address)
     if chain == "solana":
         return solana_service.get_contract_details(contract_address)
     if chain == "ethereum":
@@ -289,7 +300,8 @@ async def get_request_logs(
 @app.post("/wallets", response_model=WalletResponse, status_code=201)
 async def create_wallet(
     wallet_data: WalletCreateRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    wallet_service: WalletService = Depends(get_wallet_service)
 ):
     """Create a new wallet entry."""
     return await wallet_service.create_wallet(wallet_data)
@@ -297,7 +309,8 @@ async def create_wallet(
 @app.get("/wallets/{wallet_id}", response_model=WalletResponse)
 async def get_wallet(
     wallet_id: int,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    wallet_service: WalletService = Depends(get_wallet_service)
 ):
     """Get a wallet by ID."""
     return await wallet_service.get_wallet(wallet_id)
@@ -308,7 +321,8 @@ async def list_wallets(
     owner: Optional[str] = Query(None, description="Filter by owner"),
     limit: int = Query(100, description="Maximum number of wallets to return", ge=1, le=1000),
     offset: int = Query(0, description="Number of wallets to skip for pagination", ge=0),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    wallet_service: WalletService = Depends(get_wallet_service)
 ):
     """List wallets with optional filters."""
     return await wallet_service.list_wallets(blockchain, owner, limit, offset)
@@ -318,7 +332,8 @@ async def update_wallet(
     wallet_address: str = Query(..., description="Wallet address to update"),
     blockchain: str = Query(..., description="Blockchain of the wallet"),
     wallet_data: WalletUpdateRequest = Body(..., description="Wallet data to update"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    wallet_service: WalletService = Depends(get_wallet_service)
 ):
     """Update a wallet by address and blockchain."""
     return await wallet_service.update_wallet_by_address(blockchain, wallet_address, wallet_data)
@@ -327,7 +342,8 @@ async def update_wallet(
 async def delete_wallet(
     wallet_address: str = Query(..., description="Wallet address to delete"),
     blockchain: str = Query(..., description="Blockchain of the wallet"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    wallet_service: WalletService = Depends(get_wallet_service)
 ):
     """Delete a wallet by address and blockchain."""
     await wallet_service.delete_wallet_by_address(blockchain, wallet_address)
\ No newline at end of file
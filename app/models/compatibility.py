@@ -31,7 +31,7 @@ class CompatibilityChecker:
         
         try:
             model_class = self.response_models[model_name][version]
-            model_class(**data)
+            model_class.model_validate(data)
             return True
         except ValidationError as e:
             print(f"Validation error for {model_name} v{version}: {e}")
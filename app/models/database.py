@@ -1,7 +1,7 @@
 """
 Database models for request/response logging.
 """
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Float, Text, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Float, Text, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -72,7 +72,11 @@ class Wallet(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     __table_args__ = (
+        # Also serves as the (blockchain, wallet_address) lookup index
         UniqueConstraint('blockchain', 'wallet_address', name='uq_wallet_blockchain_address'),
+        # list_wallets orders by created_at, optionally filtered by owner
+        Index('ix_wallets_owner_created_at', 'owner', 'created_at'),
+        Index('ix_wallets_created_at', 'created_at'),
     )
 
     def __repr__(self):
@@ -1,6 +1,6 @@
 import time
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 import requests
 
@@ -16,12 +16,20 @@ from app.models.responses import (
 )
 
 
+# Date filters resolve to block numbers through getblocknobytime; the answers
+# for past timestamps are stable, so they are remembered per service instance
+_BLOCK_CACHE_MAX_ENTRIES = 1024
+_BLOCK_SETTLE_SECONDS = 600
+
+
 class EthereumService:
     def __init__(self, api_key: Optional[str] = None) -> None:
         self.api_key = api_key or Config.ETHERSCAN_API_KEY
         self.base_url = "https://api.etherscan.io/v2/api"
         self.chain_id = 1  # Ethereum Mainnet
         self.session = requests.Session()
+        # (timestamp, closest) -> block number, for timestamps safely in the past
+        self._block_by_timestamp: Dict[Tuple[int, str], int] = {}
         if not self.api_key:
             raise ValueError("Etherscan API key is required")
 
@@ -180,6 +188,11 @@ class EthereumService:
         Returns:
             Block number or None if request fails
         """
+        key = (timestamp, closest)
+        cached = self._block_by_timestamp.get(key)
+        if cached is not None:
+            return cached
+
         params = {
             "module": "block",
             "action": "getblocknobytime",
@@ -190,9 +203,15 @@ class EthereumService:
 
         if result:
             try:
-                return int(result)
+                block = int(result)
             except (ValueError, TypeError):
                 return None
+            # The block closest to a settled past timestamp never changes
+            if timestamp < time.time() - _BLOCK_SETTLE_SECONDS:
+                if len(self._block_by_timestamp) >= _BLOCK_CACHE_MAX_ENTRIES:
+                    self._block_by_timestamp.pop(next(iter(self._block_by_timestamp)))
+                self._block_by_timestamp[key] = block
+            return block
         return None
 
     def _convert_dates_to_blocks(
@@ -1,8 +1,18 @@
+import asyncio
+import hashlib
+import heapq
+import json
 import time
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from functools import partial
+from itertools import chain
+from operator import itemgetter
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Callable, Iterable, Optional, Tuple
+from urllib.parse import urlencode
 
-import requests
+import httpx
+import ijson
+import orjson
 
 from app.config import Config
 from app.models.responses import (
@@ -15,23 +25,309 @@ from app.models.responses import (
     ContractDetailsResponse,
 )
 
+# Powers of ten for scaling token base units (TRC20 decimals rarely exceed 18)
+_POW10 = tuple(10 ** i for i in range(40))
+_POW10F = tuple(float(p) for p in _POW10)
+
+
+def _pow10(decimals: int) -> int:
+    """Return 10 ** decimals, served from the lookup table for the usual range."""
+    return _POW10[decimals] if 0 <= decimals < 40 else 10 ** decimals
+
+
+def _scale_units(amount: float, decimals: int) -> float:
+    """Scale a base-unit amount down by 10**decimals using the precomputed float table."""
+    # Divide rather than multiply by a reciprocal such as 1e-6: the reciprocal is
+    # not exact, and division keeps the formatted amounts correctly rounded
+    return amount / (_POW10F[decimals] if 0 <= decimals < 40 else 10.0 ** decimals)
+
+
+def _parse_base_units(value: Any) -> int:
+    """Parse a raw token amount (usually a long decimal string) as an exact integer."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return int(float(value))
+
+
+def _format_units(value: int, decimals: int) -> str:
+    """Format an integer base-unit amount as a decimal string without going through float."""
+    if decimals <= 0:
+        return str(value)
+    whole, frac = divmod(value, _pow10(decimals))
+    return f"{whole}.{frac:0{decimals}d}".rstrip("0").rstrip(".")
+
+
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Seconds to cache TronScan responses per endpoint. Contract metadata rarely
+# changes; balances and transfers move on the ~3s block cadence.
+_CACHE_TTLS: Dict[str, float] = {
+    "/api/contract": 3600,
+    "/api/token_trc20": 3600,
+    "/api/accountv2": 5,
+    "/api/transfer/trx": 3,
+    "/api/transfer/trc20": 3,
+    "/api/token_trc20/transfers": 3,
+    "/api/token_trc20/transfers-with-status": 3,
+}
+_CACHE_MAX_ENTRIES = 1024
+
+_TRONSCAN_BASE_URL = "https://apilist.tronscanapi.com"
+
+# Process-wide pooled HTTP/2 client so TCP/TLS connections to TronScan are
+# reused across requests and service instances; closed on app shutdown
+_CLIENT = httpx.AsyncClient(
+    base_url=_TRONSCAN_BASE_URL,
+    http2=True,
+    timeout=15,
+    limits=httpx.Limits(max_keepalive_connections=50),
+    headers={"TRON-PRO-API-KEY": Config.TRONSCAN_API_KEY} if Config.TRONSCAN_API_KEY else None,
+)
+
+
+async def close_http_client() -> None:
+    """Close the shared TronScan HTTP client."""
+    await _CLIENT.aclose()
+
+
+async def _aiter_json_batches(chunks: AsyncIterator[bytes], items_path: str) -> AsyncIterator[List[Any]]:
+    """Incrementally parse JSON byte chunks, yielding the items under items_path completed by each chunk."""
+    items = ijson.sendable_list()
+    parser = ijson.items_coro(items, items_path, use_float=True)
+    async for chunk in chunks:
+        parser.send(chunk)
+        if items:
+            yield list(items)
+            del items[:]
+    parser.close()
+    if items:
+        yield list(items)
+
+
+def _key_transfer_rows(rows: Iterable[Dict[str, Any]], is_trc20: bool) -> List[Tuple[int, bool, Dict[str, Any]]]:
+    """
+    Pair raw transfer rows with their integer ms timestamp and source flag.
+
+    Nothing is formatted here: rows are only turned into Transaction objects
+    once the newest `limit` have been selected.
+    """
+    keyed: List[Tuple[int, bool, Dict[str, Any]]] = []
+    for tx in rows:
+        ts = tx.get("timestamp") or tx.get("block_timestamp")
+        try:
+            ts_ms = int(ts) if ts else 0
+        except Exception:
+            ts_ms = 0
+        keyed.append((ts_ms, is_trc20, tx))
+    return keyed
+
+
+def _parse_transfer_rows(rows: Iterable[Tuple[int, bool, Dict[str, Any]]]) -> List[Transaction]:
+    """
+    Build Transaction objects from keyed /api/transfer/trx and /api/transfer/trc20 rows.
+
+    One loop serves both kinds: TRX rows are fixed at 6 decimals and the TRX
+    symbol, TRC20 rows take both from their token info. Helpers are bound to
+    locals so the per-row loop avoids attribute and global lookups.
+    """
+    strftime = time.strftime
+    gmtime = time.gmtime
+    to_float = float
+    scale_units = _scale_units
+    construct = Transaction.model_construct
+    # Counterparties and symbols repeat across a history; share one str object per value
+    intern = {}.setdefault
+    # Transfers in the same block share a timestamp; format each second only once
+    iso_by_second: Dict[int, str] = {}
+    fee_strs_by_raw: Dict[Tuple[type, Any], Tuple[str, str]] = {}
+    txs: List[Transaction] = []
+    append = txs.append
+    for ts_ms, is_trc20, tx in rows:
+        get = tx.get
+        iso = ""
+        if ts_ms:
+            ts_sec = ts_ms // 1000
+            iso = iso_by_second.get(ts_sec)
+            if iso is None:
+                try:
+                    iso = strftime("%Y-%m-%dT%H:%M:%SZ", gmtime(ts_sec))
+                except Exception:
+                    iso = ""
+                iso_by_second[ts_sec] = iso
+
+        if is_trc20:
+            token_info = get("tokenInfo") or {}
+            info_get = token_info.get
+            try:
+                decimals = int(info_get("tokenDecimal") or info_get("decimals") or get("decimals") or 0)
+            except Exception:
+                decimals = 0
+            symbol = (
+                info_get("tokenAbbr")
+                or info_get("symbol")
+                or get("symbol")
+                or info_get("tokenName")
+                or get("token_name")
+                or "TKN"
+            )
+            symbol = str(symbol)
+            symbol = intern(symbol, symbol)
+        else:
+            decimals = 6
+            symbol = "TRX"
+
+        amount_raw = get("amount") or 0
+        try:
+            amount_fmt = scale_units(to_float(amount_raw), decimals)
+        except Exception:
+            amount_fmt = 0.0
+
+        fee = get("energy_fee") or get("fee") or 0
+        # Most rows carry one of a handful of fee values; build their strings once
+        fee_key = (fee.__class__, fee)
+        fee_strs = fee_strs_by_raw.get(fee_key)
+        if fee_strs is None:
+            try:
+                fee_fmt = to_float(fee) / 1e6
+            except Exception:
+                fee_fmt = 0.0
+            fee_strs = fee_strs_by_raw[fee_key] = (str(fee), str(fee_fmt))
+
+        from_addr = get("from") or get("ownerAddress") or ""
+        to_addr = get("to") or get("toAddress") or ""
+        append(
+            construct(
+                hash=get("hash", ""),
+                timestamp=iso,
+                from_=intern(from_addr, from_addr),
+                to=intern(to_addr, to_addr),
+                amount=str(amount_raw),
+                amount_formatted=str(amount_fmt),
+                token_symbol=symbol,
+                transaction_fee=fee_strs[0],
+                transaction_fee_formatted=fee_strs[1],
+                status="success" if bool(get("confirmed", 1)) else "failed",
+                block_number=int(get("block") or 0),
+            )
+        )
+    return txs
+
 
 class TronService:
     def __init__(self, api_key: Optional[str] = None) -> None:
         self.api_key = api_key or Config.TRONSCAN_API_KEY
-        self.base_url = "https://apilist.tronscanapi.com"
-        self.session = requests.Session()
-        if self.api_key:
-            self.session.headers.update({"TRON-PRO-API-KEY": self.api_key})
+        self.base_url = _TRONSCAN_BASE_URL
+        # The shared client already carries the configured key; only send a
+        # per-request header when this instance was given a different one
+        self._headers = (
+            {"TRON-PRO-API-KEY": self.api_key}
+            if self.api_key and self.api_key != Config.TRONSCAN_API_KEY
+            else None
+        )
+        # key -> (expires_at, value); in-flight fetches are shared so concurrent misses
+        # for the same key collapse into a single upstream call
+        self._response_cache: Dict[str, Tuple[float, Any]] = {}
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+
+    def _build_url(self, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build the request target relative to the shared client's base URL."""
+        url = path
+        if params:
+            # Encode the query string ourselves instead of having the client re-encode params per call
+            url = f"{url}?{urlencode({k: v for k, v in params.items() if v is not None}, doseq=True)}"
+        return url
+
+    def _cache_key(self, path: str, params: Optional[Dict[str, Any]]) -> str:
+        digest = hashlib.blake2b(
+            json.dumps(params or {}, sort_keys=True, default=str).encode(), digest_size=8
+        ).hexdigest()
+        return f"tron:{path}:{digest}"
+
+    def _store_cached(self, key: str, ttl: float, future: "asyncio.Future[Any]") -> None:
+        self._inflight.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        value = future.result()
+        if not value:
+            # Don't cache failures or empty payloads
+            return
+        now = time.monotonic()
+        if len(self._response_cache) >= _CACHE_MAX_ENTRIES:
+            for stale in [k for k, (expires_at, _) in self._response_cache.items() if expires_at <= now]:
+                del self._response_cache[stale]
+            while len(self._response_cache) >= _CACHE_MAX_ENTRIES:
+                del self._response_cache[next(iter(self._response_cache))]
+        self._response_cache[key] = (now + ttl, value)
+
+    async def _cached(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        fetch: Callable[[str, Optional[Dict[str, Any]]], Awaitable[Any]],
+    ) -> Any:
+        """Return fetch(path, params) through the per-endpoint TTL cache."""
+        ttl = _CACHE_TTLS.get(path)
+        if not ttl:
+            return await fetch(path, params)
+
+        key = self._cache_key(path, params)
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                return cached[1]
+            del self._response_cache[key]
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fetch(path, params))
+            self._inflight[key] = future
+            future.add_done_callback(partial(self._store_cached, key, ttl))
+        # Shield so one cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(future)
+
+    async def _fetch_json(self, path: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        resp = await _CLIENT.get(self._build_url(path, params), headers=self._headers)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        return data if isinstance(data, dict) else {}
 
-    def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    async def _fetch_rows(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        parse_rows: Callable[[Iterable[Dict[str, Any]]], List[Tuple[int, bool, Dict[str, Any]]]],
+    ) -> List[Tuple[int, bool, Dict[str, Any]]]:
+        parsed: List[Tuple[int, bool, Dict[str, Any]]] = []
+        async with _CLIENT.stream("GET", self._build_url(path, params), headers=self._headers) as resp:
+            resp.raise_for_status()
+            async for batch in _aiter_json_batches(resp.aiter_bytes(_STREAM_CHUNK_SIZE), "data.item"):
+                parsed.extend(parse_rows(batch))
+        return parsed
+
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET a TronScan endpoint, returning the JSON object or an empty dict on failure."""
         try:
-            resp = self.session.get(f"{self.base_url}{path}", params=params, timeout=15)
-            if resp.ok:
-                return resp.json()
+            return await self._cached(path, params, self._fetch_json)
         except Exception:
-            return None
-        return None
+            return {}
+
+    async def _get_rows(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        parse_rows: Callable[[Iterable[Dict[str, Any]]], List[Tuple[int, bool, Dict[str, Any]]]],
+    ) -> List[Tuple[int, bool, Dict[str, Any]]]:
+        """
+        GET a TronScan transfer endpoint and key its "data" rows as the body
+        streams in, without buffering the whole payload.
+
+        Returns an empty list on failure.
+        """
+        try:
+            return await self._cached(path, params, partial(self._fetch_rows, parse_rows=parse_rows))
+        except Exception:
+            return []
 
     def _date_to_milliseconds(self, date_str: str) -> Optional[int]:
         """
@@ -55,49 +351,64 @@ class TronService:
             print(f"Error parsing date: {e}")
             return None
 
-    def get_wallet_info(self, wallet_address: str) -> WalletInfoResponse:
-        account_data = self._get("/api/accountv2", {"address": wallet_address})
-        
+    async def _fetch_wallet_info_raw(self, wallet_address: str) -> Dict[str, Any]:
+        """Fetch the raw TronScan account payload used to build wallet info."""
+        return await self._get("/api/accountv2", {"address": wallet_address})
+
+    def _parse_account_tokens(self, account_data: Dict[str, Any]) -> List[Tuple[str, str, str, int, int]]:
+        """
+        Extract TRC10/TRC20 holdings from a raw TronScan account payload.
+
+        Returns (token_id, name, symbol, decimals, balance in base units) tuples;
+        balances are kept as exact integers rather than floats.
+        """
+        tokens: List[Tuple[str, str, str, int, int]] = []
+        for token in account_data.get("withPriceTokens", []):
+            if not isinstance(token, dict):
+                continue
+            
+            token_id = token.get("tokenId", "")
+            if token_id == "_" or not (token_id and token_id.strip()):
+                continue
+            
+            try:
+                decimals_int = int(token.get("tokenDecimal", 0))
+                balance_raw = _parse_base_units(token.get("balance", "0"))
+            except Exception:
+                decimals_int = 0
+                balance_raw = 0
+            
+            tokens.append((
+                token_id,
+                token.get("tokenName", ""),
+                token.get("tokenAbbr", ""),
+                decimals_int,
+                balance_raw,
+            ))
+        return tokens
+
+    def _build_wallet_info(self, wallet_address: str, account_data: Dict[str, Any]) -> WalletInfoResponse:
+        """Build a WalletInfoResponse from a raw TronScan account payload."""
         native_balance = 0.0
         wallet_tokens: List[WalletToken] = []
         
-        if account_data and isinstance(account_data, dict):
+        if account_data:
             balance_sun = account_data.get("balance") or 0
             try:
                 native_balance = float(balance_sun) / 1e6
             except Exception:
                 native_balance = 0.0
             
-            with_price_tokens = account_data.get("withPriceTokens", [])
-            for token in with_price_tokens:
-                if not isinstance(token, dict):
-                    continue
-                
-                token_id = token.get("tokenId", "")
-                if token_id == "_":
-                    continue
-                
-                token_name = token.get("tokenName", "")
-                token_symbol = token.get("tokenAbbr", "")
-                token_decimals = token.get("tokenDecimal", 0)
-                token_balance_raw = token.get("balance", "0")
-                
-                try:
-                    decimals_int = int(token_decimals)
-                    balance_float = float(token_balance_raw) / (10 ** decimals_int) if decimals_int > 0 else float(token_balance_raw)
-                except Exception:
-                    balance_float = 0.0
-                
-                if token_id and token_id.strip():
-                    wallet_tokens.append(
-                        WalletToken(
-                            token_address=token_id,
-                            name=token_name,
-                            symbol=token_symbol,
-                            decimals=decimals_int,
-                            balance=balance_float,
-                        )
+            for token_id, token_name, token_symbol, decimals_int, balance_raw in self._parse_account_tokens(account_data):
+                wallet_tokens.append(
+                    WalletToken.model_construct(
+                        token_address=token_id,
+                        name=token_name,
+                        symbol=token_symbol,
+                        decimals=decimals_int,
+                        balance=balance_raw / _pow10(decimals_int),
                     )
+                )
         
         native_token = NativeToken(symbol="TRX", decimals=6, balance=native_balance)
         
@@ -108,7 +419,11 @@ class TronService:
             tokens=wallet_tokens,
         )
 
-    def get_transactions_list(self, wallet_address: str, limit: int = 20, token: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None) -> TransactionsListResponse:
+    async def get_wallet_info(self, wallet_address: str) -> WalletInfoResponse:
+        account_data = await self._fetch_wallet_info_raw(wallet_address)
+        return self._build_wallet_info(wallet_address, account_data)
+
+    async def get_transactions_list(self, wallet_address: str, limit: int = 20, token: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None) -> TransactionsListResponse:
         """
         Get transaction history for a wallet. If token is specified, only returns transactions
         for that specific TRC20 token contract. Otherwise, returns both TRX and TRC20 transactions.
@@ -141,7 +456,7 @@ class TronService:
             min_timestamp = self._date_to_milliseconds(start_date)
         if end_date:
             max_timestamp = self._date_to_milliseconds(end_date)
-            
+
         if token:
             # If token is specified, only get transactions for that specific TRC20 token
             # Use the corrected TRC20 transfers endpoint with proper parameters
@@ -160,106 +475,91 @@ class TronService:
             if max_timestamp:
                 trc20_token_params["max_timestamp"] = max_timestamp
             
-            # Try the TRC20 transfers endpoint
-            trc20_token_data = self._get("/api/token_trc20/transfers", trc20_token_params)
+            # Try the TRC20 transfers endpoint, fetching account balances alongside it
+            trc20_token_data, account_data = await asyncio.gather(
+                self._get("/api/token_trc20/transfers", trc20_token_params),
+                self._fetch_wallet_info_raw(wallet_address),
+            )
             
-            # Process token transactions
-            if isinstance(trc20_token_data, dict):
-                # Check if we have token_transfers in the response
-                token_transfers = trc20_token_data.get("token_transfers", [])
+            # Process token transactions; fall back to the data field (alternative response format)
+            token_transfers = trc20_token_data.get("token_transfers") or trc20_token_data.get("data") or []
+
+            strftime = time.strftime
+            gmtime = time.gmtime
+            for tx in token_transfers:
+                if not isinstance(tx, dict):
+                    continue
+                get = tx.get
+                token_info = get("tokenInfo") or {}
+                info_get = token_info.get
                 
-                # If token_transfers is empty, try the data field (alternative response format)
-                if not token_transfers:
-                    token_transfers = trc20_token_data.get("data", [])
+                ts = get("timestamp") or get("block_timestamp")
+                amount_raw = get("amount") or get("value") or 0
+                fee = get("energy_fee") or get("fee") or get("cost") or 0
                 
-                for tx in token_transfers:
-                    if not isinstance(tx, dict):
-                        continue
-                    
-                    # Extract timestamp
-                    ts = tx.get("timestamp") or tx.get("block_timestamp")
+                # Timestamp, decimals, amount and fee all fall back to defaults
+                # together if any of them is malformed
+                try:
                     iso = ""
                     if ts:
-                        try:
-                            # Handle both timestamp formats (seconds and milliseconds)
-                            timestamp_val = int(ts)
-                            if timestamp_val > 1e12:  # Milliseconds
-                                timestamp_val = timestamp_val / 1000
-                            iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp_val))
-                        except Exception:
-                            iso = ""
-                    
-                    # Extract amount and decimals
-                    amount_raw = tx.get("amount") or tx.get("value") or 0
-                    decimals = 0
-                    
-                    # Get decimals from multiple possible sources
-                    if "decimals" in tx and tx.get("decimals") is not None:
-                        decimals = int(tx.get("decimals"))
-                    
-                    token_info = tx.get("tokenInfo") or {}
-                    if not decimals and token_info:
-                        decimals = int(token_info.get("tokenDecimal") or token_info.get("decimals") or 0)
-                    
-                    # If still no decimals found, try to get from token name (USDT typically has 6 decimals)
-                    if not decimals:
-                        symbol = (token_info.get("tokenAbbr") or token_info.get("symbol") or 
-                                tx.get("symbol") or "").upper()
-                        if symbol in ["USDT", "JUSDT"]:
-                            decimals = 6
-                        else:
-                            decimals = 6  # Default for most TRC20 tokens on TRON
-                    
-                    # Format amount
-                    try:
-                        amount_fmt = float(amount_raw) / (10 ** decimals) if decimals > 0 else float(amount_raw)
-                    except Exception:
-                        amount_fmt = 0.0
-                    
-                    # Extract fee information
-                    fee = tx.get("energy_fee") or tx.get("fee") or tx.get("cost") or 0
-                    try:
-                        fee_fmt = float(fee) / 1e6  # TRX fees are in SUN (1 TRX = 1e6 SUN)
-                    except Exception:
-                        fee_fmt = 0.0
-                    
-                    # Extract addresses
-                    from_addr = tx.get("from") or tx.get("from_address") or tx.get("ownerAddress") or ""
-                    to_addr = tx.get("to") or tx.get("to_address") or tx.get("toAddress") or ""
-                    
-                    # Extract symbol
-                    symbol = (
-                        token_info.get("tokenAbbr") or
-                        token_info.get("symbol") or
-                        tx.get("symbol") or
-                        token_info.get("tokenName") or
-                        tx.get("token_name") or
-                        "TRC20"
+                        # Handle both timestamp formats (seconds and milliseconds)
+                        timestamp_val = int(ts)
+                        if timestamp_val > 1e12:
+                            timestamp_val //= 1000
+                        iso = strftime("%Y-%m-%dT%H:%M:%SZ", gmtime(timestamp_val))
+                    # Decimals from the row, then its token info; 6 is the default
+                    # for most TRC20 tokens on TRON (including USDT). The row value
+                    # is converted first so a "0" string falls through like 0 does
+                    row_decimals = get("decimals")
+                    decimals = (
+                        (int(row_decimals) if row_decimals is not None else 0)
+                        or int(info_get("tokenDecimal") or info_get("decimals") or 0)
+                        or 6
                     )
-                    
-                    # Determine transaction status
-                    status = "success"
-                    if "confirmed" in tx:
-                        status = "success" if bool(tx.get("confirmed", 1)) else "failed"
-                    elif "status" in tx:
-                        status = "success" if tx.get("status") in [1, "1", "SUCCESS", True] else "failed"
-                    
-                    txs.append(
-                        Transaction(
-                            hash=tx.get("hash", "") or tx.get("transaction_id", ""),
-                            timestamp=iso,
-                            from_=from_addr,
-                            to=to_addr,
-                            amount=str(amount_raw),
-                            amount_formatted=str(amount_fmt),
-                            token_symbol=str(symbol),
-                            transaction_fee=str(fee),
-                            transaction_fee_formatted=str(fee_fmt),
-                            status=status,
-                            block_number=int(tx.get("block") or tx.get("blockNumber") or 0),
-                        )
+                    amount_fmt = _scale_units(float(amount_raw), decimals)
+                    fee_fmt = float(fee) / 1e6  # TRX fees are in SUN (1 TRX = 1e6 SUN)
+                except Exception:
+                    iso = ""
+                    amount_fmt = 0.0
+                    fee_fmt = 0.0
+                
+                # Extract addresses
+                from_addr = get("from") or get("from_address") or get("ownerAddress") or ""
+                to_addr = get("to") or get("to_address") or get("toAddress") or ""
+                
+                # Extract symbol
+                symbol = (
+                    info_get("tokenAbbr") or
+                    info_get("symbol") or
+                    get("symbol") or
+                    info_get("tokenName") or
+                    get("token_name") or
+                    "TRC20"
+                )
+                
+                # Determine transaction status
+                status = "success"
+                if "confirmed" in tx:
+                    status = "success" if bool(get("confirmed", 1)) else "failed"
+                elif "status" in tx:
+                    status = "success" if get("status") in (1, "1", "SUCCESS", True) else "failed"
+                
+                txs.append(
+                    Transaction.model_construct(
+                        hash=get("hash", "") or get("transaction_id", ""),
+                        timestamp=iso,
+                        from_=from_addr,
+                        to=to_addr,
+                        amount=str(amount_raw),
+                        amount_formatted=str(amount_fmt),
+                        token_symbol=str(symbol),
+                        transaction_fee=str(fee),
+                        transaction_fee_formatted=str(fee_fmt),
+                        status=status,
+                        block_number=int(get("block") or get("blockNumber") or 0),
                     )
-            
+                )
+        
             # If no transactions found with the above method, try alternative endpoint
             if not txs:
                 # Try the alternative endpoint used in your curl command
@@ -279,60 +579,54 @@ class TronService:
                 if max_timestamp:
                     alt_params["max_timestamp"] = max_timestamp
 
-                alt_data = self._get("/api/token_trc20/transfers-with-status", alt_params)
+                alt_data = await self._get("/api/token_trc20/transfers-with-status", alt_params)
                 
-                if isinstance(alt_data, dict):
-                    token_transfers = alt_data.get("data", [])
+                token_transfers = alt_data.get("data") or []
+
+                for tx in token_transfers:
+                    if not isinstance(tx, dict):
+                        continue
+                    get = tx.get
                     
-                    for tx in token_transfers:
-                        if not isinstance(tx, dict):
-                            continue
-                        
-                        ts = tx.get("timestamp") or tx.get("block_timestamp")
+                    ts = get("timestamp") or get("block_timestamp")
+                    amount_raw = get("amount") or get("value") or 0
+                    fee = get("energy_fee") or get("fee") or 0
+                    
+                    try:
                         iso = ""
                         if ts:
-                            try:
-                                timestamp_val = int(ts)
-                                if timestamp_val > 1e12:
-                                    timestamp_val = timestamp_val / 1000
-                                iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp_val))
-                            except Exception:
-                                iso = ""
-                        
-                        amount_raw = tx.get("amount") or tx.get("value") or 0
-                        decimals = int(tx.get("decimals") or 6)  # Default to 6 for TRON
-                        
-                        try:
-                            amount_fmt = float(amount_raw) / (10 ** decimals)
-                        except Exception:
-                            amount_fmt = 0.0
-                        
-                        fee = tx.get("energy_fee") or tx.get("fee") or 0
-                        try:
-                            fee_fmt = float(fee) / 1e6
-                        except Exception:
-                            fee_fmt = 0.0
-                        
-                        from_addr = tx.get("from") or tx.get("ownerAddress") or ""
-                        to_addr = tx.get("to") or tx.get("toAddress") or ""
-                        symbol = tx.get("symbol") or tx.get("tokenAbbr") or "TRC20"
-                        
-                        txs.append(
-                            Transaction(
-                                hash=tx.get("hash", "") or tx.get("transaction_id", ""),
-                                timestamp=iso,
-                                from_=from_addr,
-                                to=to_addr,
-                                amount=str(amount_raw),
-                                amount_formatted=str(amount_fmt),
-                                token_symbol=str(symbol),
-                                transaction_fee=str(fee),
-                                transaction_fee_formatted=str(fee_fmt),
-                                status="success" if bool(tx.get("confirmed", 1)) else "failed",
-                                block_number=int(tx.get("block") or 0),
-                            )
+                            timestamp_val = int(ts)
+                            if timestamp_val > 1e12:
+                                timestamp_val //= 1000
+                            iso = strftime("%Y-%m-%dT%H:%M:%SZ", gmtime(timestamp_val))
+                        decimals = int(get("decimals") or 6)  # Default to 6 for TRON
+                        amount_fmt = _scale_units(float(amount_raw), decimals)
+                        fee_fmt = float(fee) / 1e6
+                    except Exception:
+                        iso = ""
+                        amount_fmt = 0.0
+                        fee_fmt = 0.0
+                    
+                    from_addr = get("from") or get("ownerAddress") or ""
+                    to_addr = get("to") or get("toAddress") or ""
+                    symbol = get("symbol") or get("tokenAbbr") or "TRC20"
+                    
+                    txs.append(
+                        Transaction.model_construct(
+                            hash=get("hash", "") or get("transaction_id", ""),
+                            timestamp=iso,
+                            from_=from_addr,
+                            to=to_addr,
+                            amount=str(amount_raw),
+                            amount_formatted=str(amount_fmt),
+                            token_symbol=str(symbol),
+                            transaction_fee=str(fee),
+                            transaction_fee_formatted=str(fee_fmt),
+                            status="success" if bool(get("confirmed", 1)) else "failed",
+                            block_number=int(get("block") or 0),
                         )
-            
+                    )
+        
         else:
             # Original logic when no token filter is applied
             trx_params = {
@@ -350,8 +644,6 @@ class TronService:
             if max_timestamp:
                 trx_params["max_timestamp"] = max_timestamp
 
-            trx_data = self._get("/api/transfer/trx", trx_params)
-
             trc20_params = {
                 "address": wallet_address,
                 "limit": limit,
@@ -367,130 +659,58 @@ class TronService:
             if max_timestamp:
                 trc20_params["max_timestamp"] = max_timestamp
 
-            trc20_data = self._get("/api/transfer/trc20", trc20_params)
+            # Both transfer lists and the account balances are fetched concurrently;
+            # transfer rows are parsed as each response body streams in
+            trx_rows, trc20_rows, account_data = await asyncio.gather(
+                self._get_rows("/api/transfer/trx", trx_params, partial(_key_transfer_rows, is_trc20=False)),
+                self._get_rows("/api/transfer/trc20", trc20_params, partial(_key_transfer_rows, is_trc20=True)),
+                self._fetch_wallet_info_raw(wallet_address),
+            )
 
-            if isinstance(trx_data, dict):
-                for tx in trx_data.get("data", []):
-                    ts = tx.get("timestamp") or tx.get("block_timestamp")
-                    try:
-                        iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(int(ts) / 1000)) if ts else ""
-                    except Exception:
-                        iso = ""
-                    amount_raw = tx.get("amount") or 0
-                    try:
-                        amount_fmt = float(amount_raw) / 1e6
-                    except Exception:
-                        amount_fmt = 0.0
-                    fee = tx.get("energy_fee") or tx.get("fee") or 0
-                    try:
-                        fee_fmt = float(fee) / 1e6
-                    except Exception:
-                        fee_fmt = 0.0
-                    from_addr = tx.get("from") or tx.get("ownerAddress") or ""
-                    to_addr = tx.get("to") or tx.get("toAddress") or ""
-                    txs.append(
-                        Transaction(
-                            hash=tx.get("hash", ""),
-                            timestamp=iso,
-                            from_=from_addr,
-                            to=to_addr,
-                            amount=str(amount_raw),
-                            amount_formatted=str(amount_fmt),
-                            token_symbol="TRX",
-                            transaction_fee=str(fee),
-                            transaction_fee_formatted=str(fee_fmt),
-                            status="success" if bool(tx.get("confirmed", 1)) else "failed",
-                            block_number=int(tx.get("block") or 0),
-                        )
-                    )
+            # Keep the newest `limit` transfers across both lists by integer ms
+            # timestamp; O(N log limit) and independent of upstream page order
+            top = heapq.nlargest(limit, chain(trx_rows, trc20_rows), key=itemgetter(0))
 
-            if isinstance(trc20_data, dict):
-                for tx in trc20_data.get("data", []):
-                    ts = tx.get("timestamp") or tx.get("block_timestamp")
-                    try:
-                        iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(int(ts) / 1000)) if ts else ""
-                    except Exception:
-                        iso = ""
-                    amount_raw = tx.get("amount") or 0
-                    decimals = 0
-                    if "decimals" in tx and tx.get("decimals") is not None:
-                        decimals = int(tx.get("decimals"))
-                    token_info = tx.get("tokenInfo") or {}
-                    decimals = int(token_info.get("tokenDecimal") or token_info.get("decimals") or decimals)
-                    try:
-                        amount_fmt = float(amount_raw) / (10 ** decimals) if decimals else float(amount_raw)
-                    except Exception:
-                        amount_fmt = 0.0
-                    fee = tx.get("energy_fee") or tx.get("fee") or 0
-                    try:
-                        fee_fmt = float(fee) / 1e6
-                    except Exception:
-                        fee_fmt = 0.0
-                    from_addr = tx.get("from") or tx.get("ownerAddress") or ""
-                    to_addr = tx.get("to") or tx.get("toAddress") or ""
-                    symbol = (
-                        token_info.get("tokenAbbr")
-                        or token_info.get("symbol")
-                        or tx.get("symbol")
-                        or token_info.get("tokenName")
-                        or tx.get("token_name")
-                        or "TKN"
-                    )
-                    txs.append(
-                        Transaction(
-                            hash=tx.get("hash", ""),
-                            timestamp=iso,
-                            from_=from_addr,
-                            to=to_addr,
-                            amount=str(amount_raw),
-                            amount_formatted=str(amount_fmt),
-                            token_symbol=str(symbol),
-                            transaction_fee=str(fee),
-                            transaction_fee_formatted=str(fee_fmt),
-                            status="success" if bool(tx.get("confirmed", 1)) else "failed",
-                            block_number=int(tx.get("block") or 0),
-                        )
-                    )
-
-            # Sort by timestamp and limit results
-            txs.sort(key=lambda t: t.timestamp, reverse=True)
-            txs = txs[:limit]
+            # Only the kept rows are formatted
+            txs = _parse_transfer_rows(top)
 
-        # Get wallet info for balances
-        wallet_info = self.get_wallet_info(wallet_address)
-        native_symbol = wallet_info.native_token.symbol
-        native_balance_formatted = format(wallet_info.native_token.balance, "f")
-        native_balance_raw = str(
-            int(wallet_info.native_token.balance * (10 ** wallet_info.native_token.decimals))
-        )
+        # Balances come straight from the account payload fetched above; no
+        # second /api/accountv2 round-trip or WalletInfoResponse build needed
+        native_balance_sun = 0
         token_balances: List[TxnTokenBalance] = []
-        for t in wallet_info.tokens:
-            raw_balance = int(t.balance * (10 ** t.decimals))
-            formatted_balance = format(t.balance, "f")
-            token_balances.append(
-                TxnTokenBalance(
-                    contract_address=t.token_address,
-                    name=t.name,
-                    symbol=t.symbol,
-                    decimals=t.decimals,
-                    balance=str(raw_balance),
-                    balance_formatted=formatted_balance,
+        if account_data:
+            try:
+                native_balance_sun = _parse_base_units(account_data.get("balance") or 0)
+            except Exception:
+                native_balance_sun = 0
+            for token_id, token_name, token_symbol, decimals_int, balance_raw in self._parse_account_tokens(account_data):
+                token_balances.append(
+                    TxnTokenBalance.model_construct(
+                        contract_address=token_id,
+                        name=token_name,
+                        symbol=token_symbol,
+                        decimals=decimals_int,
+                        balance=str(balance_raw),
+                        balance_formatted=_format_units(balance_raw, decimals_int),
+                    )
                 )
-            )
 
         return TransactionsListResponse(
             blockchain="tron",
             wallet_address=wallet_address,
-            native_balance=native_balance_raw,
-            native_balance_formatted=native_balance_formatted,
-            native_symbol=native_symbol,
+            native_balance=str(native_balance_sun),
+            native_balance_formatted=format(native_balance_sun / 1e6, "f"),
+            native_symbol="TRX",
             tokens=token_balances,
             transactions=txs,
         )
 
-    def get_contract_details(self, contract_address: str) -> ContractDetailsResponse:
-        contract_data = self._get("/api/contract", {"contract": contract_address})
-        token_data = self._get("/api/token_trc20", {"contract": contract_address})
+    async def get_contract_details(self, contract_address: str) -> ContractDetailsResponse:
+        # The contract and token metadata lookups are independent; fetch them together
+        contract_data, token_data = await asyncio.gather(
+            self._get("/api/contract", {"contract": contract_address}),
+            self._get("/api/token_trc20", {"contract": contract_address}),
+        )
         name = ""
         symbol = ""
         decimals = 0
@@ -503,7 +723,7 @@ class TronService:
         transfer_count = 0
         is_mintable = False
         is_burnable = False
-        if token_data and isinstance(token_data, dict):
+        if token_data:
             name = token_data.get("name") or token_data.get("tokenName") or name
             symbol = token_data.get("symbol") or token_data.get("tokenAbbr") or symbol
             decimals = int(token_data.get("decimals") or token_data.get("tokenDecimal") or decimals)
@@ -515,7 +735,7 @@ class TronService:
             )
             try:
                 total_supply = str(supply_raw)
-                total_supply_value = int(supply_raw) / (10 ** decimals) if decimals else int(supply_raw)
+                total_supply_value = int(supply_raw) / _pow10(decimals) if decimals else int(supply_raw)
                 total_supply_formatted = str(total_supply_value)
             except Exception:
                 total_supply = str(supply_raw)
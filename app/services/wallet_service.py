@@ -1,19 +1,31 @@
 from typing import List, Optional
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
-from app.database import db_manager
 from app.models.database import Wallet
 from app.models.responses import WalletCreateRequest, WalletUpdateRequest, WalletResponse
 
+# Base listing query, built once; filters and paging are appended per call and
+# SQLAlchemy's statement cache reuses the compiled form
+_LIST_STMT = select(Wallet).order_by(Wallet.created_at.desc())
+
 
 class WalletService:
-    """Service for wallet CRUD operations."""
+    """
+    Service for wallet CRUD operations.
+
+    Bound to one request-scoped session (see app.database.get_db_session), so
+    every call made while handling a request shares the same pool checkout.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
 
     async def create_wallet(self, wallet_data: WalletCreateRequest) -> WalletResponse:
         """Create a new wallet entry."""
-        session = await db_manager.get_session()
+        session = self.session
         try:
             wallet = Wallet(
                 type=wallet_data.type,
@@ -40,21 +52,13 @@ class WalletService:
                 status_code=500,
                 detail=f"Failed to create wallet: {str(e)}"
             )
-        finally:
-            await session.close()
 
     async def get_wallet(self, wallet_id: int) -> WalletResponse:
         """Get a wallet by ID."""
-        session = await db_manager.get_session()
-        try:
-            query = select(Wallet).where(Wallet.id == wallet_id)
-            result = await session.execute(query)
-            wallet = result.scalar_one_or_none()
-            if not wallet:
-                raise HTTPException(status_code=404, detail="Wallet not found")
-            return self._wallet_to_response(wallet)
-        finally:
-            await session.close()
+        wallet = await self.session.get(Wallet, wallet_id)
+        if not wallet:
+            raise HTTPException(status_code=404, detail="Wallet not found")
+        return self._wallet_to_response(wallet)
 
     async def list_wallets(
         self,
@@ -64,19 +68,15 @@ class WalletService:
         offset: int = 0
     ) -> List[WalletResponse]:
         """List wallets with optional filters."""
-        session = await db_manager.get_session()
-        try:
-            query = select(Wallet)
-            if blockchain:
-                query = query.where(Wallet.blockchain == blockchain.lower())
-            if owner:
-                query = query.where(Wallet.owner == owner)
-            query = query.order_by(Wallet.created_at.desc()).limit(limit).offset(offset)
-            result = await session.execute(query)
-            wallets = result.scalars().all()
-            return [self._wallet_to_response(w) for w in wallets]
-        finally:
-            await session.close()
+        query = _LIST_STMT
+        if blockchain:
+            query = query.where(Wallet.blockchain == blockchain.lower())
+        if owner:
+            query = query.where(Wallet.owner == owner)
+        query = query.limit(limit).offset(offset)
+        result = await self.session.execute(query)
+        wallets = result.scalars().all()
+        return [self._wallet_to_response(w) for w in wallets]
 
     async def update_wallet(
         self,
@@ -84,38 +84,7 @@ class WalletService:
         wallet_data: WalletUpdateRequest
     ) -> WalletResponse:
         """Update a wallet by ID."""
-        session = await db_manager.get_session()
-        try:
-            query = select(Wallet).where(Wallet.id == wallet_id)
-            result = await session.execute(query)
-            wallet = result.scalar_one_or_none()
-            if not wallet:
-                raise HTTPException(status_code=404, detail="Wallet not found")
-            
-            if wallet_data.type is not None:
-                wallet.type = wallet_data.type
-            if wallet_data.name is not None:
-                wallet.name = wallet_data.name
-            if wallet_data.note is not None:
-                wallet.note = wallet_data.note
-            if wallet_data.owner is not None:
-                wallet.owner = wallet_data.owner
-            if wallet_data.exchange_name is not None:
-                wallet.exchange_name = wallet_data.exchange_name
-            
-            await session.commit()
-            await session.refresh(wallet)
-            return self._wallet_to_response(wallet)
-        except HTTPException:
-            raise
-        except Exception as e:
-            await session.rollback()
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to update wallet: {str(e)}"
-            )
-        finally:
-            await session.close()
+        return await self._update_where(wallet_data, Wallet.id == wallet_id)
 
     async def update_wallet_by_address(
         self,
@@ -124,30 +93,28 @@ class WalletService:
         wallet_data: WalletUpdateRequest
     ) -> WalletResponse:
         """Update a wallet by blockchain and address."""
-        session = await db_manager.get_session()
+        return await self._update_where(
+            wallet_data,
+            Wallet.blockchain == blockchain.lower(),
+            Wallet.wallet_address == wallet_address
+        )
+
+    async def _update_where(self, wallet_data: WalletUpdateRequest, *criteria) -> WalletResponse:
+        """Apply the provided fields to the matching wallet in a single UPDATE ... RETURNING."""
+        session = self.session
+        values = wallet_data.model_dump(exclude_none=True)
         try:
-            query = select(Wallet).where(
-                Wallet.blockchain == blockchain.lower(),
-                Wallet.wallet_address == wallet_address
-            )
+            if values:
+                query = update(Wallet).where(*criteria).values(**values).returning(Wallet)
+            else:
+                # Nothing to change; just read the current row back
+                query = select(Wallet).where(*criteria)
             result = await session.execute(query)
             wallet = result.scalar_one_or_none()
             if not wallet:
                 raise HTTPException(status_code=404, detail="Wallet not found")
             
-            if wallet_data.type is not None:
-                wallet.type = wallet_data.type
-            if wallet_data.name is not None:
-                wallet.name = wallet_data.name
-            if wallet_data.note is not None:
-                wallet.note = wallet_data.note
-            if wallet_data.owner is not None:
-                wallet.owner = wallet_data.owner
-            if wallet_data.exchange_name is not None:
-                wallet.exchange_name = wallet_data.exchange_name
-            
             await session.commit()
-            await session.refresh(wallet)
             return self._wallet_to_response(wallet)
         except HTTPException:
             raise
@@ -157,44 +124,26 @@ class WalletService:
                 status_code=500,
                 detail=f"Failed to update wallet: {str(e)}"
             )
-        finally:
-            await session.close()
 
     async def delete_wallet(self, wallet_id: int) -> None:
         """Delete a wallet by ID."""
-        session = await db_manager.get_session()
-        try:
-            query = select(Wallet).where(Wallet.id == wallet_id)
-            result = await session.execute(query)
-            wallet = result.scalar_one_or_none()
-            if not wallet:
-                raise HTTPException(status_code=404, detail="Wallet not found")
-            await session.delete(wallet)
-            await session.commit()
-        except HTTPException:
-            raise
-        except Exception as e:
-            await session.rollback()
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to delete wallet: {str(e)}"
-            )
-        finally:
-            await session.close()
+        await self._delete_where(Wallet.id == wallet_id)
 
     async def delete_wallet_by_address(self, blockchain: str, wallet_address: str) -> None:
         """Delete a wallet by blockchain and address."""
-        session = await db_manager.get_session()
+        await self._delete_where(
+            Wallet.blockchain == blockchain.lower(),
+            Wallet.wallet_address == wallet_address
+        )
+
+    async def _delete_where(self, *criteria) -> None:
+        """Delete the matching wallet with a single DELETE ... RETURNING id."""
+        session = self.session
         try:
-            query = select(Wallet).where(
-                Wallet.blockchain == blockchain.lower(),
-                Wallet.wallet_address == wallet_address
-            )
+            query = delete(Wallet).where(*criteria).returning(Wallet.id)
             result = await session.execute(query)
-            wallet = result.scalar_one_or_none()
-            if not wallet:
+            if result.scalar_one_or_none() is None:
                 raise HTTPException(status_code=404, detail="Wallet not found")
-            await session.delete(wallet)
             await session.commit()
         except HTTPException:
             raise
@@ -204,24 +153,19 @@ class WalletService:
                 status_code=500,
                 detail=f"Failed to delete wallet: {str(e)}"
             )
-        finally:
-            await session.close()
 
     async def get_wallet_by_address(self, blockchain: str, wallet_address: str) -> Optional[WalletResponse]:
         """Get a wallet by blockchain and address."""
-        session = await db_manager.get_session()
-        try:
-            query = select(Wallet).where(
-                Wallet.blockchain == blockchain.lower(),
-                Wallet.wallet_address == wallet_address
-            )
-            result = await session.execute(query)
-            wallet = result.scalar_one_or_none()
-            if wallet:
-                return self._wallet_to_response(wallet)
-            return None
-        finally:
-            await session.close()
+        session = self.session
+        query = select(Wallet).where(
+            Wallet.blockchain == blockchain.lower(),
+            Wallet.wallet_address == wallet_address
+        )
+        result = await session.execute(query)
+        wallet = result.scalar_one_or_none()
+        if wallet:
+            return self._wallet_to_response(wallet)
+        return None
 
     def _wallet_to_response(self, wallet: Wallet) -> WalletResponse:
         """Convert Wallet model to WalletResponse."""
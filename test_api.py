@@ -3,168 +3,186 @@
 Test script for the Multi-Blockchain API with authentication.
 """
 
-import requests
+import asyncio
 import json
 import sys
+from functools import partial
+
+import httpx
 
 BASE_URL = "http://localhost:8000"
 
-def test_health_check():
+# The checks run concurrently, so each one appends its output to the `lines`
+# list it is given and the caller prints the lists in test order.
+
+async def test_health_check(client, lines):
     """Test the health check endpoint (no auth required)."""
-    print("1. Testing health check endpoint...")
+    lines.append("1. Testing health check endpoint...")
     try:
-        response = requests.get(f"{BASE_URL}/")
-        print(f"   Status: {response.status_code}")
-        print(f"   Response: {response.json()}")
+        response = await client.get("/")
+        lines.append(f"   Status: {response.status_code}")
+        lines.append(f"   Response: {response.json()}")
         return response.status_code == 200
     except Exception as e:
-        print(f"   Error: {e}")
+        lines.append(f"   Error: {e}")
         return False
 
-def test_unauthorized_access():
+async def test_unauthorized_access(client, lines):
     """Test accessing protected endpoint without authentication."""
-    print("\n2. Testing unauthorized access (should return 401)...")
+    lines.append("\n2. Testing unauthorized access (should return 401)...")
     try:
-        response = requests.get(
-            f"{BASE_URL}/wallet_info",
+        response = await client.get(
+            "/wallet_info",
             params={
                 "wallet_address": "0xde0b295669a9fd93d5f28d9ec85e40f4cb697bae",
                 "blockchain": "ethereum"
             }
         )
-        print(f"   Status: {response.status_code}")
+        lines.append(f"   Status: {response.status_code}")
         if response.status_code == 401:
-            print("   ✅ Correctly returned 401 Unauthorized")
+            lines.append("   ✅ Correctly returned 401 Unauthorized")
             return True
         else:
-            print("   ❌ Expected 401 but got different status")
+            lines.append("   ❌ Expected 401 but got different status")
             return False
     except Exception as e:
-        print(f"   Error: {e}")
+        lines.append(f"   Error: {e}")
         return False
 
-def login(username="admin", password="password123"):
+async def login(client, lines, username="admin", password="password123"):
     """Login and get JWT token."""
-    print(f"\n3. Logging in as {username}...")
+    lines.append(f"\n3. Logging in as {username}...")
     try:
-        response = requests.post(
-            f"{BASE_URL}/auth/login",
+        response = await client.post(
+            "/auth/login",
             data={"username": username, "password": password}
         )
         if response.status_code == 200:
             token_data = response.json()
             token = token_data["access_token"]
-            print(f"   ✅ Login successful")
-            print(f"   Token: {token[:20]}...")
+            lines.append(f"   ✅ Login successful")
+            lines.append(f"   Token: {token[:20]}...")
             return token
         else:
-            print(f"   ❌ Login failed with status {response.status_code}")
-            print(f"   Response: {response.text}")
+            lines.append(f"   ❌ Login failed with status {response.status_code}")
+            lines.append(f"   Response: {response.text}")
             return None
     except Exception as e:
-        print(f"   Error: {e}")
+        lines.append(f"   Error: {e}")
         return None
 
-def test_authenticated_request(token):
+async def test_authenticated_request(client, token, lines):
     """Test protected endpoint with valid token."""
-    print("\n4. Testing authenticated request...")
+    lines.append("\n4. Testing authenticated request...")
     try:
         headers = {"Authorization": f"Bearer {token}"}
-        response = requests.get(
-            f"{BASE_URL}/wallet_info",
+        response = await client.get(
+            "/wallet_info",
             params={
                 "wallet_address": "0xde0b295669a9fd93d5f28d9ec85e40f4cb697bae",
                 "blockchain": "ethereum"
             },
             headers=headers
         )
-        print(f"   Status: {response.status_code}")
+        lines.append(f"   Status: {response.status_code}")
         if response.status_code == 200:
-            print("   ✅ Authenticated request successful")
+            lines.append("   ✅ Authenticated request successful")
             # Print first few lines of response
             response_text = response.text
-            lines = response_text.split('\n')[:5]
-            print(f"   Response preview: {lines}")
+            preview = response_text.split('\n')[:5]
+            lines.append(f"   Response preview: {preview}")
             return True
         else:
-            print(f"   ❌ Request failed with status {response.status_code}")
-            print(f"   Response: {response.text}")
+            lines.append(f"   ❌ Request failed with status {response.status_code}")
+            lines.append(f"   Response: {response.text}")
             return False
     except Exception as e:
-        print(f"   Error: {e}")
+        lines.append(f"   Error: {e}")
         return False
 
-def test_invalid_token():
+async def test_invalid_token(client, lines):
     """Test with invalid token."""
-    print("\n5. Testing with invalid token (should return 401)...")
+    lines.append("\n5. Testing with invalid token (should return 401)...")
     try:
         headers = {"Authorization": "Bearer invalid_token_here"}
-        response = requests.get(
-            f"{BASE_URL}/wallet_info",
+        response = await client.get(
+            "/wallet_info",
             params={
                 "wallet_address": "0xde0b295669a9fd93d5f28d9ec85e40f4cb697bae",
                 "blockchain": "ethereum"
             },
             headers=headers
         )
-        print(f"   Status: {response.status_code}")
+        lines.append(f"   Status: {response.status_code}")
         if response.status_code == 401:
-            print("   ✅ Correctly returned 401 for invalid token")
+            lines.append("   ✅ Correctly returned 401 for invalid token")
             return True
         else:
-            print("   ❌ Expected 401 but got different status")
+            lines.append("   ❌ Expected 401 but got different status")
             return False
     except Exception as e:
-        print(f"   Error: {e}")
+        lines.append(f"   Error: {e}")
         return False
 
-def test_user_info(token):
+async def test_user_info(client, token, lines):
     """Test user info endpoint."""
-    print("\n6. Testing user info endpoint...")
+    lines.append("\n6. Testing user info endpoint...")
     try:
         headers = {"Authorization": f"Bearer {token}"}
-        response = requests.get(f"{BASE_URL}/auth/me", headers=headers)
-        print(f"   Status: {response.status_code}")
+        response = await client.get("/auth/me", headers=headers)
+        lines.append(f"   Status: {response.status_code}")
         if response.status_code == 200:
             user_info = response.json()
-            print(f"   ✅ User info retrieved: {user_info}")
+            lines.append(f"   ✅ User info retrieved: {user_info}")
             return True
         else:
-            print(f"   ❌ Failed to get user info")
+            lines.append(f"   ❌ Failed to get user info")
             return False
     except Exception as e:
-        print(f"   Error: {e}")
+        lines.append(f"   Error: {e}")
         return False
 
-def main():
+async def _run_in_order(*tests):
+    """Run the tests concurrently, then print their output in the given order."""
+    outputs = [[] for _ in tests]
+    results = await asyncio.gather(*(test(lines) for test, lines in zip(tests, outputs)))
+    for lines in outputs:
+        print("\n".join(lines))
+    return results
+
+async def main():
     """Run all tests."""
     print("=== Multi-Blockchain API Authentication Tests ===")
     
-    # Check if API is running
-    try:
-        response = requests.get(f"{BASE_URL}/", timeout=5)
-    except requests.exceptions.RequestException:
-        print(f"❌ Cannot connect to API at {BASE_URL}")
-        print("Make sure the service is running with:")
-        print("  docker-compose up -d")
-        print("  or")
-        print("  uvicorn app.main:app --host 0.0.0.0 --port 8000")
-        sys.exit(1)
-    
-    results = []
-    
-    # Run tests
-    results.append(test_health_check())
-    results.append(test_unauthorized_access())
-    
-    token = login()
-    if token:
-        results.append(test_authenticated_request(token))
-        results.append(test_invalid_token())
-        results.append(test_user_info(token))
-    else:
-        print("❌ Cannot continue tests without valid token")
-        sys.exit(1)
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=30) as client:
+        # Check if API is running
+        try:
+            await client.get("/", timeout=5)
+        except httpx.HTTPError:
+            print(f"❌ Cannot connect to API at {BASE_URL}")
+            print("Make sure the service is running with:")
+            print("  docker-compose up -d")
+            print("  or")
+            print("  uvicorn app.main:app --host 0.0.0.0 --port 8000")
+            sys.exit(1)
+        
+        # Health, unauthorized access and login are independent; once a token
+        # is available the remaining checks can also run together
+        health_ok, unauthorized_ok, token = await _run_in_order(
+            partial(test_health_check, client),
+            partial(test_unauthorized_access, client),
+            partial(login, client),
+        )
+        if not token:
+            print("❌ Cannot continue tests without valid token")
+            sys.exit(1)
+        
+        results = [health_ok, unauthorized_ok]
+        results.extend(await _run_in_order(
+            partial(test_authenticated_request, client, token),
+            partial(test_invalid_token, client),
+            partial(test_user_info, client, token),
+        ))
     
     # Summary
     passed = sum(results)
@@ -180,4 +198,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
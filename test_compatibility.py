@@ -16,12 +16,22 @@ from app.models.responses import (
     Transaction
 )
 from app.models.compatibility import compatibility_checker, check_api_compatibility
+from pydantic import TypeAdapter, ValidationError
 import json
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+# Build the validator once and reuse it across the validation tests
+_WALLET_ADAPTER = TypeAdapter(WalletInfoResponse)
 
 
 def test_response_validation():
     """Test response validation with sample data."""
-    print("=== Testing Response Validation ===\n")
+    lines = ["=== Testing Response Validation ===\n"]
     
     # Sample wallet info data
     wallet_info_data = {
@@ -45,16 +55,16 @@ def test_response_validation():
     
     # Test valid data
     try:
-        wallet_response = WalletInfoResponse(**wallet_info_data)
-        print("✅ WalletInfoResponse validation passed")
-        print(f"   Wallet: {wallet_response.wallet_address}")
-        print(f"   Blockchain: {wallet_response.blockchain}")
-        print(f"   Native token: {wallet_response.native_token.symbol} - {wallet_response.native_token.balance}")
-        print(f"   Token count: {len(wallet_response.tokens)}")
+        wallet_response = _WALLET_ADAPTER.validate_python(wallet_info_data)
+        lines.append("✅ WalletInfoResponse validation passed")
+        lines.append(f"   Wallet: {wallet_response.wallet_address}")
+        lines.append(f"   Blockchain: {wallet_response.blockchain}")
+        lines.append(f"   Native token: {wallet_response.native_token.symbol} - {wallet_response.native_token.balance}")
+        lines.append(f"   Token count: {len(wallet_response.tokens)}")
     except Exception as e:
-        print(f"❌ WalletInfoResponse validation failed: {e}")
+        lines.append(f"❌ WalletInfoResponse validation failed: {e}")
     
-    print()
+    lines.append("")
     
     # Test invalid data
     invalid_data = {
@@ -68,14 +78,19 @@ def test_response_validation():
         "tokens": []
     }
     
+    rejected = False
     try:
-        WalletInfoResponse(**invalid_data)
-        print("❌ Invalid data validation should have failed")
-    except Exception as e:
-        print("✅ Invalid data correctly rejected")
-        print(f"   Error: {e}")
+        _WALLET_ADAPTER.validate_python(invalid_data)
+        lines.append("❌ Invalid data validation should have failed")
+    except ValidationError as e:
+        rejected = True
+        lines.append("✅ Invalid data correctly rejected")
+        lines.append(f"   Error: {e}")
     
-    print()
+    lines.append("")
+    print("\n".join(lines))
+    
+    assert rejected, "WalletInfoResponse accepted invalid data"
 
 
 def test_compatibility_checking():
@@ -85,64 +100,69 @@ def test_compatibility_checking():
     # Generate compatibility report
     report = check_api_compatibility()
     print("API Compatibility Report:")
-    print(json.dumps(report, indent=2))
+    if orjson is not None:
+        print(orjson.dumps(report, option=orjson.OPT_INDENT_2).decode())
+    else:
+        print(json.dumps(report, indent=2))
     print()
     
-    # Test individual model compatibility
+    # Test individual model compatibility; the API report above already holds
+    # each model's report, so reuse it instead of regenerating
     for model_name in compatibility_checker.response_models.keys():
         print(f"Testing {model_name}:")
-        model_report = compatibility_checker.generate_compatibility_report(model_name)
+        model_report = report["models"][model_name]
         print(f"  Versions: {model_report['versions']}")
         print(f"  Breaking changes: {len(model_report['breaking_changes'])}")
         print()
 
 
+# Sample service responses, built once at import and shared read-only
+SAMPLE_SERVICE_RESPONSES = MappingProxyType({
+    "wallet_info": {
+        "wallet_address": "0x1234567890abcdef1234567890abcdef12345678",
+        "blockchain": "ethereum",
+        "native_token": {
+            "symbol": "ETH",
+            "decimals": 18,
+            "balance": 1.5
+        },
+        "tokens": []
+    },
+    "transactions_list": {
+        "blockchain": "ethereum",
+        "wallet_address": "0x1234567890abcdef1234567890abcdef12345678",
+        "native_balance": "1500000000000000000",
+        "native_balance_formatted": "1.500000000000000000",
+        "native_symbol": "ETH",
+        "tokens": [],
+        "transactions": []
+    },
+    "contract_details": {
+        "contract_address": "0xA0b86a33E6441b8C4C8C0C4C0C4C0C4C0C4C0C4C",
+        "blockchain": "ethereum",
+        "name": "USD Coin",
+        "symbol": "USDC",
+        "decimals": 6,
+        "total_supply": "1000000000000000",
+        "total_supply_formatted": "1000000000.000000",
+        "creator": "",
+        "creation_time": "",
+        "verified": True,
+        "holder_count": 0,
+        "transfer_count": 0,
+        "is_mintable": False,
+        "is_burnable": False
+    }
+})
+
+
 def test_service_response_validation():
     """Test service response validation."""
     print("=== Testing Service Response Validation ===\n")
     
     from app.models.compatibility import validate_service_response
     
-    # Sample service responses
-    sample_responses = {
-        "wallet_info": {
-            "wallet_address": "0x1234567890abcdef1234567890abcdef12345678",
-            "blockchain": "ethereum",
-            "native_token": {
-                "symbol": "ETH",
-                "decimals": 18,
-                "balance": 1.5
-            },
-            "tokens": []
-        },
-        "transactions_list": {
-            "blockchain": "ethereum",
-            "wallet_address": "0x1234567890abcdef1234567890abcdef12345678",
-            "native_balance": "1500000000000000000",
-            "native_balance_formatted": "1.500000000000000000",
-            "native_symbol": "ETH",
-            "tokens": [],
-            "transactions": []
-        },
-        "contract_details": {
-            "contract_address": "0xA0b86a33E6441b8C4C8C0C4C0C4C0C4C0C4C0C4C",
-            "blockchain": "ethereum",
-            "name": "USD Coin",
-            "symbol": "USDC",
-            "decimals": 6,
-            "total_supply": "1000000000000000",
-            "total_supply_formatted": "1000000000.000000",
-            "creator": "",
-            "creation_time": "",
-            "verified": True,
-            "holder_count": 0,
-            "transfer_count": 0,
-            "is_mintable": False,
-            "is_burnable": False
-        }
-    }
-    
-    for endpoint, data in sample_responses.items():
+    for endpoint, data in SAMPLE_SERVICE_RESPONSES.items():
         try:
             is_valid = validate_service_response("test_service", endpoint, data)
             print(f"✅ {endpoint}: {'Valid' if is_valid else 'Invalid'}")
@@ -4,202 +4,303 @@ Integration test for Solana token filtering with the main API.
 Tests that the enhanced Solana service works correctly with the FastAPI endpoints.
 """
 
-import requests
+import asyncio
+import base64
 import sys
 import json
+import os
 import time
+from pathlib import Path
+
+import httpx
+import ijson
+import orjson
 
 BASE_URL = "http://localhost:8000"
+USERNAME = "admin"
+PASSWORD = "password123"
+
+# Tokens are reused across runs until shortly before they expire
+TOKEN_CACHE_PATH = Path.home() / ".cache" / "multichain_proxy" / "jwt.json"
+TOKEN_MIN_REMAINING_SECONDS = 60
+
+# The four endpoint tests are independent and run concurrently on one pooled
+# client, so each appends its output to the `lines` list it is given and the
+# caller prints the lists in test order.
 
-def login_and_get_token():
-    """Login and get JWT token for API authentication."""
+def _token_expiry(token):
+    """Read the exp claim from a JWT payload (no signature check)."""
+    payload = token.split(".")[1]
+    payload += "=" * (-len(payload) % 4)
+    return json.loads(base64.urlsafe_b64decode(payload)).get("exp", 0)
+
+def _read_token_cache():
     try:
-        response = requests.post(
-            f"{BASE_URL}/auth/login",
-            data={"username": "admin", "password": "password123"}
+        return json.loads(TOKEN_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def _load_cached_token(cache_key):
+    """Return a cached token for cache_key that is not about to expire, if any."""
+    token = _read_token_cache().get(cache_key)
+    if not token:
+        return None
+    try:
+        if _token_expiry(token) - time.time() > TOKEN_MIN_REMAINING_SECONDS:
+            return token
+    except (IndexError, ValueError):
+        pass
+    return None
+
+def _write_token_cache(cache):
+    """Write the token cache readable by the current user only (it holds bearer tokens)."""
+    try:
+        TOKEN_CACHE_PATH.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd = os.open(TOKEN_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(json.dumps(cache))
+        os.chmod(TOKEN_CACHE_PATH, 0o600)  # also tighten a file created with looser permissions
+    except OSError:
+        pass
+
+def _store_cached_token(cache_key, token):
+    cache = _read_token_cache()
+    cache[cache_key] = token
+    _write_token_cache(cache)
+
+def _drop_cached_token(cache_key):
+    cache = _read_token_cache()
+    if cache.pop(cache_key, None) is not None:
+        _write_token_cache(cache)
+
+async def login_and_get_token(client):
+    """Login and get JWT token for API authentication, reusing a cached one when still valid."""
+    cache_key = f"{USERNAME}@{BASE_URL}"
+    token = _load_cached_token(cache_key)
+    if token:
+        # An unexpired token can still be rejected (e.g. after the server's
+        # JWT_SECRET_KEY changes), so confirm it before reusing it
+        try:
+            response = await client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+            if response.status_code == 200:
+                return token
+        except httpx.HTTPError:
+            pass
+        _drop_cached_token(cache_key)
+
+    try:
+        response = await client.post(
+            "/auth/login",
+            data={"username": USERNAME, "password": PASSWORD}
         )
         if response.status_code == 200:
-            token_data = response.json()
-            return token_data["access_token"]
+            token_data = orjson.loads(response.content)
+            token = token_data["access_token"]
+            _store_cached_token(cache_key, token)
+            return token
     except Exception as e:
         print(f"Login failed: {e}")
     return None
 
-def test_solana_wallet_info(token):
+async def test_solana_wallet_info(client, lines):
     """Test Solana wallet info endpoint."""
-    print("\n=== Testing Solana Wallet Info Endpoint ===")
+    lines.append("\n=== Testing Solana Wallet Info Endpoint ===")
 
-    headers = {"Authorization": f"Bearer {token}"}
     test_wallet = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
 
     try:
-        response = requests.get(
-            f"{BASE_URL}/wallet_info",
+        response = await client.get(
+            "/wallet_info",
             params={
                 "wallet_address": test_wallet,
                 "blockchain": "solana"
-            },
-            headers=headers
+            }
         )
 
         if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Solana wallet info retrieved successfully")
-            print(f"   Wallet: {data['wallet_address'][:10]}...")
-            print(f"   SOL Balance: {data['native_token']['balance']}")
-            print(f"   Token Count: {len(data['tokens'])}")
+            data = orjson.loads(response.content)
+            lines.append(f"✅ Solana wallet info retrieved successfully")
+            lines.append(f"   Wallet: {data['wallet_address'][:10]}...")
+            lines.append(f"   SOL Balance: {data['native_token']['balance']}")
+            lines.append(f"   Token Count: {len(data['tokens'])}")
             return True
         else:
-            print(f"❌ Request failed with status {response.status_code}")
-            print(f"   Response: {response.text}")
+            lines.append(f"❌ Request failed with status {response.status_code}")
+            lines.append(f"   Response: {response.text}")
     except Exception as e:
-        print(f"❌ Wallet info test failed: {e}")
+        lines.append(f"❌ Wallet info test failed: {e}")
 
     return False
 
-def test_solana_all_transactions(token):
+async def test_solana_all_transactions(client, lines):
     """Test Solana transactions endpoint without token filter."""
-    print("\n=== Testing Solana All Transactions Endpoint ===")
+    lines.append("\n=== Testing Solana All Transactions Endpoint ===")
 
-    headers = {"Authorization": f"Bearer {token}"}
     test_wallet = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
 
     try:
-        response = requests.get(
-            f"{BASE_URL}/transactions_list",
-            params={
-                "wallet_address": test_wallet,
-                "blockchain": "solana",
-                "limit": 5
-            },
-            headers=headers
-        )
-
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Solana all transactions retrieved successfully")
-            print(f"   Transaction count: {len(data['transactions'])}")
-            print(f"   Native balance: {data['native_balance_formatted']} {data['native_symbol']}")
-
-            if data['transactions']:
-                latest_tx = data['transactions'][0]
-                print(f"   Latest TX: {latest_tx['hash'][:10]}... - {latest_tx['token_symbol']}")
-
-            return True
-        else:
-            print(f"❌ Request failed with status {response.status_code}")
-            print(f"   Response: {response.text}")
+        params = {
+            "wallet_address": test_wallet,
+            "blockchain": "solana",
+            "limit": 5
+        }
+        async with client.stream("GET", "/transactions_list", params=params) as response:
+            if response.status_code != 200:
+                await response.aread()
+                lines.append(f"❌ Request failed with status {response.status_code}")
+                lines.append(f"   Response: {response.text}")
+                return False
+
+            # Parse the body incrementally as it arrives: count transactions and
+            # keep only the few scalar fields printed below
+            fields = {}
+            tx_count = 0
+            events = ijson.sendable_list()
+            parser = ijson.parse_coro(events)
+            decoded_bytes = 0
+            async for chunk in response.aiter_bytes(65536):
+                decoded_bytes += len(chunk)
+                parser.send(chunk)
+                for prefix, event, value in events:
+                    if prefix == "transactions.item" and event == "start_map":
+                        tx_count += 1
+                    elif prefix in ("native_balance_formatted", "native_symbol"):
+                        fields[prefix] = value
+                    elif tx_count == 1 and prefix in ("transactions.item.hash", "transactions.item.token_symbol"):
+                        fields[prefix] = value
+                del events[:]
+            parser.close()
+            wire_bytes = response.num_bytes_downloaded
+            encoding = response.headers.get("content-encoding", "identity")
+
+        lines.append(f"✅ Solana all transactions retrieved successfully")
+        lines.append(f"   Transaction count: {tx_count}")
+        lines.append(f"   Payload: {wire_bytes} bytes on the wire ({encoding}), {decoded_bytes} decoded")
+        lines.append(f"   Native balance: {fields['native_balance_formatted']} {fields['native_symbol']}")
+
+        if tx_count:
+            lines.append(
+                f"   Latest TX: {fields['transactions.item.hash'][:10]}... - {fields['transactions.item.token_symbol']}"
+            )
+
+        return True
     except Exception as e:
-        print(f"❌ All transactions test failed: {e}")
+        lines.append(f"❌ All transactions test failed: {e}")
 
     return False
 
-def test_solana_token_filtered_transactions(token):
+async def test_solana_token_filtered_transactions(client, lines):
     """Test Solana transactions endpoint with token filter."""
-    print("\n=== Testing Solana Token-Filtered Transactions Endpoint ===")
+    lines.append("\n=== Testing Solana Token-Filtered Transactions Endpoint ===")
 
-    headers = {"Authorization": f"Bearer {token}"}
     test_wallet = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
     usdc_mint = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"  # USDC mint
 
     try:
-        response = requests.get(
-            f"{BASE_URL}/transactions_list",
+        response = await client.get(
+            "/transactions_list",
             params={
                 "wallet_address": test_wallet,
                 "blockchain": "solana",
                 "limit": 5,
                 "token": usdc_mint
-            },
-            headers=headers
+            }
         )
 
         if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Solana token-filtered transactions retrieved successfully")
-            print(f"   USDC transaction count: {len(data['transactions'])}")
+            data = orjson.loads(response.content)
+            lines.append(f"✅ Solana token-filtered transactions retrieved successfully")
+            lines.append(f"   USDC transaction count: {len(data['transactions'])}")
 
             if data['transactions']:
-                print("   USDC Transactions found:")
+                lines.append("   USDC Transactions found:")
                 for tx in data['transactions'][:3]:  # Show first 3
-                    print(f"     • {tx['hash'][:10]}... - {tx['amount_formatted']} {tx['token_symbol']}")
+                    lines.append(f"     • {tx['hash'][:10]}... - {tx['amount_formatted']} {tx['token_symbol']}")
             else:
-                print("   ℹ️  No USDC transactions found (normal if wallet has no USDC activity)")
+                lines.append("   ℹ️  No USDC transactions found (normal if wallet has no USDC activity)")
 
             return True
         else:
-            print(f"❌ Request failed with status {response.status_code}")
-            print(f"   Response: {response.text}")
+            lines.append(f"❌ Request failed with status {response.status_code}")
+            lines.append(f"   Response: {response.text}")
     except Exception as e:
-        print(f"❌ Token-filtered transactions test failed: {e}")
+        lines.append(f"❌ Token-filtered transactions test failed: {e}")
 
     return False
 
-def test_solana_contract_details(token):
+async def test_solana_contract_details(client, lines):
     """Test Solana contract details endpoint."""
-    print("\n=== Testing Solana Contract Details Endpoint ===")
+    lines.append("\n=== Testing Solana Contract Details Endpoint ===")
 
-    headers = {"Authorization": f"Bearer {token}"}
     usdc_mint = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"  # USDC mint
 
     try:
-        response = requests.get(
-            f"{BASE_URL}/contract_details",
+        response = await client.get(
+            "/contract_details",
             params={
                 "contract_address": usdc_mint,
                 "blockchain": "solana"
-            },
-            headers=headers
+            }
         )
 
         if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Solana contract details retrieved successfully")
-            print(f"   Token: {data['name']} ({data['symbol']})")
-            print(f"   Decimals: {data['decimals']}")
-            print(f"   Total Supply: {data['total_supply_formatted']}")
+            data = orjson.loads(response.content)
+            lines.append(f"✅ Solana contract details retrieved successfully")
+            lines.append(f"   Token: {data['name']} ({data['symbol']})")
+            lines.append(f"   Decimals: {data['decimals']}")
+            lines.append(f"   Total Supply: {data['total_supply_formatted']}")
             return True
         else:
-            print(f"❌ Request failed with status {response.status_code}")
-            print(f"   Response: {response.text}")
+            lines.append(f"❌ Request failed with status {response.status_code}")
+            lines.append(f"   Response: {response.text}")
     except Exception as e:
-        print(f"❌ Contract details test failed: {e}")
+        lines.append(f"❌ Contract details test failed: {e}")
 
     return False
 
-def main():
+async def main_async():
     """Run integration tests."""
     print("🚀 Starting Solana Integration Tests with API")
     print("=" * 60)
 
-    # Check if API is running
-    try:
-        response = requests.get(f"{BASE_URL}/", timeout=5)
-        if response.status_code != 200:
-            print(f"❌ API health check failed: {response.status_code}")
+    # Solana RPC-backed endpoints can be slow, so allow generous read timeouts
+    async with httpx.AsyncClient(
+        base_url=BASE_URL, timeout=120, headers={"Accept-Encoding": "gzip"}
+    ) as client:
+        # Check if API is running
+        try:
+            response = await client.get("/", timeout=5)
+            if response.status_code != 200:
+                print(f"❌ API health check failed: {response.status_code}")
+                return 1
+        except httpx.HTTPError:
+            print(f"❌ Cannot connect to API at {BASE_URL}")
+            print("Make sure the service is running with:")
+            print("  uvicorn app.main:app --host 0.0.0.0 --port 8000")
             return 1
-    except requests.exceptions.RequestException:
-        print(f"❌ Cannot connect to API at {BASE_URL}")
-        print("Make sure the service is running with:")
-        print("  uvicorn app.main:app --host 0.0.0.0 --port 8000")
-        return 1
 
-    print("✅ API is running")
+        print("✅ API is running")
 
-    # Login and get token
-    token = login_and_get_token()
-    if not token:
-        print("❌ Failed to get authentication token")
-        return 1
+        # Login and get token
+        token = await login_and_get_token(client)
+        if not token:
+            print("❌ Failed to get authentication token")
+            return 1
 
-    print(f"✅ Authentication successful")
+        print(f"✅ Authentication successful")
+        client.headers["Authorization"] = f"Bearer {token}"
 
-    # Run tests
-    results = []
-    results.append(test_solana_wallet_info(token))
-    results.append(test_solana_all_transactions(token))
-    results.append(test_solana_token_filtered_transactions(token))
-    results.append(test_solana_contract_details(token))
+        # Run tests concurrently, then print their output in test order
+        tests = (
+            test_solana_wallet_info,
+            test_solana_all_transactions,
+            test_solana_token_filtered_transactions,
+            test_solana_contract_details,
+        )
+        outputs = [[] for _ in tests]
+        results = await asyncio.gather(*(test(client, lines) for test, lines in zip(tests, outputs)))
+        for lines in outputs:
+            print("\n".join(lines))
 
     # Summary
     passed = sum(results)
@@ -223,5 +324,9 @@ def main():
         print("❌ Some integration tests failed")
         return 1
 
+def main():
+    """Run integration tests."""
+    return asyncio.run(main_async())
+
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
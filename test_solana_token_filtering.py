@@ -4,6 +4,7 @@ Test script for Solana token filtering functionality.
 This script tests the enhanced Solana service with token-specific transaction filtering.
 """
 
+import asyncio
 import sys
 import os
 import time
@@ -12,9 +13,39 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from app.services.solana_service import SolanaService
 from app.models.responses import TransactionsListResponse
 
+def _timed(fn, *args, **kwargs):
+    """Call fn and return (result, elapsed seconds)."""
+    start_ns = time.perf_counter_ns()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter_ns() - start_ns) / 1e9
+
+def bench(fn, *args, n=5, **kwargs):
+    """Return the fastest of n timed calls to fn, in seconds."""
+    return min(_timed(fn, *args, **kwargs)[1] for _ in range(n))
+
+def _unwrap(outcome):
+    """Return the (result, elapsed) pair from a gathered call, re-raising its error."""
+    if isinstance(outcome, BaseException):
+        raise outcome
+    return outcome
+
+async def _run_independent(service, test_wallet, usdc_mint):
+    """
+    Issue the independent RPC-backed calls (tests 1, 2, 3 and 5) at once;
+    the service is synchronous, so each call
+    runs in a worker thread and the batch takes as long as the slowest RPC.
+    """
+    return await asyncio.gather(
+        asyncio.to_thread(_timed, service.get_wallet_info, test_wallet),
+        asyncio.to_thread(_timed, service.get_transactions_list, test_wallet, limit=5),
+        asyncio.to_thread(_timed, service.get_transactions_list, test_wallet, limit=5, token=usdc_mint),
+        asyncio.to_thread(_timed, service._get_token_accounts_for_mint, test_wallet, usdc_mint),
+        return_exceptions=True,
+    )
+
 def test_solana_service():
     """Test the enhanced Solana service functionality."""
-    print("🚀 Testing Enhanced Solana Service with Token Filtering\n")
+    lines = ["🚀 Testing Enhanced Solana Service with Token Filtering\n"]
 
     # Initialize service
     service = SolanaService()
@@ -24,95 +55,100 @@ def test_solana_service():
     test_wallet = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"  # Example wallet
     usdc_mint = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"  # USDC mint address
 
-    print("=== Test 1: Get Wallet Info ===")
+    wallet_outcome, all_txs_outcome, token_txs_outcome, token_accounts_outcome = asyncio.run(
+        _run_independent(service, test_wallet, usdc_mint)
+    )
+
+    lines.append("=== Test 1: Get Wallet Info ===")
     try:
-        wallet_info = service.get_wallet_info(test_wallet)
-        print(f"✅ Wallet info retrieved successfully")
-        print(f"   SOL Balance: {wallet_info.native_token.balance}")
-        print(f"   Token count: {len(wallet_info.tokens)}")
+        wallet_info, _ = _unwrap(wallet_outcome)
+        lines.append(f"✅ Wallet info retrieved successfully")
+        lines.append(f"   SOL Balance: {wallet_info.native_token.balance}")
+        lines.append(f"   Token count: {len(wallet_info.tokens)}")
         if wallet_info.tokens:
-            print(f"   First token: {wallet_info.tokens[0].symbol} - {wallet_info.tokens[0].balance}")
+            lines.append(f"   First token: {wallet_info.tokens[0].symbol} - {wallet_info.tokens[0].balance}")
     except Exception as e:
-        print(f"❌ Wallet info test failed: {e}")
+        lines.append(f"❌ Wallet info test failed: {e}")
 
-    print("\n=== Test 2: Get All Transactions ===")
+    lines.append("\n=== Test 2: Get All Transactions ===")
     try:
-        all_txs = service.get_transactions_list(test_wallet, limit=5)
-        print(f"✅ All transactions retrieved successfully")
-        print(f"   Transaction count: {len(all_txs.transactions)}")
-        print(f"   Native balance: {all_txs.native_balance_formatted} {all_txs.native_symbol}")
+        all_txs, _ = _unwrap(all_txs_outcome)
+        lines.append(f"✅ All transactions retrieved successfully")
+        lines.append(f"   Transaction count: {len(all_txs.transactions)}")
+        lines.append(f"   Native balance: {all_txs.native_balance_formatted} {all_txs.native_symbol}")
 
         if all_txs.transactions:
             latest_tx = all_txs.transactions[0]
-            print(f"   Latest transaction: {latest_tx.hash[:10]}... - {latest_tx.amount_formatted} {latest_tx.token_symbol}")
+            lines.append(f"   Latest transaction: {latest_tx.hash[:10]}... - {latest_tx.amount_formatted} {latest_tx.token_symbol}")
     except Exception as e:
-        print(f"❌ All transactions test failed: {e}")
+        lines.append(f"❌ All transactions test failed: {e}")
 
-    print("\n=== Test 3: Get Token-Specific Transactions (USDC) ===")
+    lines.append("\n=== Test 3: Get Token-Specific Transactions (USDC) ===")
     try:
-        token_txs = service.get_transactions_list(test_wallet, limit=5, token=usdc_mint)
-        print(f"✅ Token-specific transactions retrieved successfully")
-        print(f"   USDC transaction count: {len(token_txs.transactions)}")
+        token_txs, _ = _unwrap(token_txs_outcome)
+        lines.append(f"✅ Token-specific transactions retrieved successfully")
+        lines.append(f"   USDC transaction count: {len(token_txs.transactions)}")
 
         if token_txs.transactions:
             for tx in token_txs.transactions:
-                print(f"   USDC TX: {tx.hash[:10]}... - {tx.amount_formatted} {tx.token_symbol}")
+                lines.append(f"   USDC TX: {tx.hash[:10]}... - {tx.amount_formatted} {tx.token_symbol}")
         else:
-            print("   No USDC transactions found (this might be normal if wallet has no USDC activity)")
+            lines.append("   No USDC transactions found (this might be normal if wallet has no USDC activity)")
     except Exception as e:
-        print(f"❌ Token-specific transactions test failed: {e}")
+        lines.append(f"❌ Token-specific transactions test failed: {e}")
 
-    print("\n=== Test 4: Performance - Cache Statistics ===")
+    lines.append("\n=== Test 4: Performance - Cache Statistics ===")
     try:
         cache_stats = service.get_cache_stats()
-        print("✅ Cache statistics retrieved:")
+        lines.append("✅ Cache statistics retrieved:")
         for key, value in cache_stats.items():
-            print(f"   {key}: {value}")
+            lines.append(f"   {key}: {value}")
     except Exception as e:
-        print(f"❌ Cache statistics test failed: {e}")
+        lines.append(f"❌ Cache statistics test failed: {e}")
 
-    print("\n=== Test 5: Token Account Discovery ===")
+    lines.append("\n=== Test 5: Token Account Discovery ===")
     try:
-        token_accounts = service._get_token_accounts_for_mint(test_wallet, usdc_mint)
-        print(f"✅ Token accounts discovery successful")
-        print(f"   USDC token accounts found: {len(token_accounts)}")
+        token_accounts, _ = _unwrap(token_accounts_outcome)
+        lines.append(f"✅ Token accounts discovery successful")
+        lines.append(f"   USDC token accounts found: {len(token_accounts)}")
         for account in token_accounts:
-            print(f"   Token account: {account}")
+            lines.append(f"   Token account: {account}")
     except Exception as e:
-        print(f"❌ Token account discovery test failed: {e}")
+        lines.append(f"❌ Token account discovery test failed: {e}")
 
-    print("\n=== Test 6: Cache Performance Test ===")
+    lines.append("\n=== Test 6: Cache Performance Test ===")
     try:
-        print("Testing cache performance by making repeated requests...")
+        lines.append("Testing cache performance by making repeated requests...")
 
-        # First request (should populate cache)
-        start_time = time.time()
-        service.get_wallet_info(test_wallet)
-        first_request_time = time.time() - start_time
+        # First request, timed on its own against an empty cache (the batch
+        # above ran it alongside other RPC calls, which would skew the comparison)
+        service.clear_cache()
+        _, first_request_time = _timed(service.get_wallet_info, test_wallet)
 
-        # Second request (should use cache)
-        start_time = time.time()
+        # Cached requests: warm up once, then keep the best of several runs
         service.get_wallet_info(test_wallet)
-        second_request_time = time.time() - start_time
+        second_request_time = bench(service.get_wallet_info, test_wallet)
 
-        print(f"✅ Cache performance test completed")
-        print(f"   First request: {first_request_time:.3f}s")
-        print(f"   Second request: {second_request_time:.3f}s")
+        lines.append(f"✅ Cache performance test completed")
+        lines.append(f"   First request: {first_request_time:.3f}s")
+        lines.append(f"   Second request (best of 5): {second_request_time:.6f}s")
 
         if second_request_time < first_request_time:
-            print(f"   🚀 Cache improved performance by {((first_request_time - second_request_time) / first_request_time) * 100:.1f}%")
+            lines.append(f"   🚀 Cache improved performance by {((first_request_time - second_request_time) / first_request_time) * 100:.1f}%")
 
     except Exception as e:
-        print(f"❌ Cache performance test failed: {e}")
+        lines.append(f"❌ Cache performance test failed: {e}")
 
-    print("\n=== Test 7: Clear Cache ===")
+    lines.append("\n=== Test 7: Clear Cache ===")
     try:
         service.clear_cache()
         cache_stats_after_clear = service.get_cache_stats()
-        print("✅ Cache cleared successfully")
-        print(f"   Cache stats after clear: {cache_stats_after_clear}")
+        lines.append("✅ Cache cleared successfully")
+        lines.append(f"   Cache stats after clear: {cache_stats_after_clear}")
     except Exception as e:
-        print(f"❌ Clear cache test failed: {e}")
+        lines.append(f"❌ Clear cache test failed: {e}")
+
+    print("\n".join(lines))
 
 def test_edge_cases():
     """Test edge cases and error handling."""